@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Benchmark the ReAct agent against the native tool calling agent.
+
+For every task it records how many LLM calls the agent needed, how many
+outputs or tool calls were invalid (unparsable ReAct text, malformed native
+tool calls, unknown tools, arguments failing the *Input schema, tool errors)
+and whether the expected tool was used.
+Requires a running Ollama server with the model from config.json.
+
+    python3 benchmarks/bench_agent_modes.py [--runs 3]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+from typing import Any, Dict, List
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from langchain_core.callbacks import BaseCallbackHandler
+from src.agent import AnimeMaidAgent
+
+# (prompt, expected tool or None for plain conversation)
+# Only tools without side effects outside the terminal are exercised.
+TASKS = [
+    ("hii", None),
+    ("What's my system information?", "get_system_info"),
+    ("Show me the running processes.", "check_running_processes"),
+    ("Execute `echo hello` for me.", "execute_shell_command"),
+    (f"Search for the word 'Sakura' inside {os.path.join(ROOT_DIR, 'README.md')}.", "search_in_file"),
+]
+
+# AgentExecutor reports output it could not parse (in either mode) as a call to this pseudo tool
+PARSE_ERROR_TOOL = "_Exception"
+
+# Observation returned by tools with handle_validation_error=True
+VALIDATION_ERROR = "Tool input validation error"
+
+
+class BenchCallbackHandler(BaseCallbackHandler):
+    """Counts LLM round-trips, tool calls and invalid calls for a single task"""
+
+    def __init__(self, tool_names):
+        super().__init__()
+        self.tool_names = set(tool_names)
+        self.llm_calls = 0
+        self.invalid_calls = 0
+        self.tools_used = []
+
+    def on_llm_start(self, serialized: Dict[str, Any], prompts: List[str], **kwargs):
+        self.llm_calls += 1
+
+    def on_chat_model_start(self, serialized: Dict[str, Any], messages, **kwargs):
+        self.llm_calls += 1
+
+    def on_agent_action(self, action, **kwargs):
+        if action.tool == PARSE_ERROR_TOOL or action.tool not in self.tool_names:
+            self.invalid_calls += 1
+        else:
+            self.tools_used.append(action.tool)
+
+    def on_tool_end(self, output, **kwargs):
+        if str(output).startswith(VALIDATION_ERROR):
+            self.invalid_calls += 1
+
+    def on_tool_error(self, error, **kwargs):
+        self.invalid_calls += 1
+
+
+def run_task(agent: AnimeMaidAgent, prompt: str, expected_tool) -> Dict[str, Any]:
+    handler = BenchCallbackHandler([t.name for t in agent.agent_executor.tools])
+    start = time.perf_counter()
+    try:
+        # Keep the agent's own chatter out of the report
+        with contextlib.redirect_stdout(io.StringIO()):
+            agent.agent_executor.invoke({
+                "input": prompt,
+                "chat_history": [],
+                "user_home_prefix": agent.user_home_prefix
+            }, callbacks=[handler])
+        failed = False
+    except Exception:
+        failed = True
+    elapsed = time.perf_counter() - start
+
+    if expected_tool is None:
+        tool_ok = not handler.tools_used
+    else:
+        tool_ok = expected_tool in handler.tools_used
+
+    return {
+        "llm_calls": handler.llm_calls,
+        "invalid_calls": handler.invalid_calls,
+        "success": not failed and tool_ok,
+        "seconds": elapsed,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=3, help="Repetitions of every task per mode.")
+    parser.add_argument("--config", default=os.path.join(ROOT_DIR, "config.json"))
+    args = parser.parse_args()
+
+    agent = AnimeMaidAgent(config_path=args.config)
+    agent.is_sleeping = False
+    print(f"Model: {agent.ollama_model}, {len(TASKS)} tasks x {args.runs} runs\n")
+
+    for mode in ("react", "tool_calling"):
+        agent.agent_mode = mode
+        agent.agent_executor = None # Don't report the previous mode if setup fails
+        agent.setup_agent()
+        if not agent.agent_executor:
+            print(f"{mode:<14} failed to initialize")
+            continue
+        agent.agent_executor.verbose = False
+
+        results = [run_task(agent, prompt, expected)
+                   for _ in range(args.runs)
+                   for prompt, expected in TASKS]
+
+        total = len(results)
+        llm_calls = sum(r["llm_calls"] for r in results)
+        invalid_calls = sum(r["invalid_calls"] for r in results)
+        successes = sum(r["success"] for r in results)
+        seconds = sum(r["seconds"] for r in results)
+        print(f"{mode:<14} llm calls/task: {llm_calls / total:.2f}  "
+              f"invalid calls: {invalid_calls}  "
+              f"success: {successes}/{total} ({100 * successes / total:.0f}%)  "
+              f"avg time: {seconds / total:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Measure wake-to-ready and turn-to-prompt latency of the CLI screens.
+
+Drives the real MaidCLI (listen_for_wake_word, animate_wake_up,
+handle_command) against a stub agent whose model takes --warm-up-seconds to
+load, speaking through the stub TTS engine into a silent player, so Ollama,
+speakers and a microphone are not needed.
+
+"before" swaps in LegacyRenderer, which draws screens the way the CLI did
+before TerminalRenderer: running `clear` in a shell, a blocking animation and
+waiting for Enter; the model only loads on the first question, as there was
+no warm-up then. "after" is the shipped TerminalRenderer, in normal and in
+fast mode.
+
+Master's Enter keypresses are answered instantly. The last column shows
+whether the reply is still on screen once the next prompt is ready.
+
+    python3 benchmarks/bench_cli_latency.py [--warm-up-seconds 2.0]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import subprocess
+import sys
+import threading
+import time
+from unittest import mock
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from src.cli import MaidCLI
+from src.renderer import TerminalRenderer
+
+QUESTION = "hii"
+REPLY = "Hii Master! How can Sakura help you today?"
+# Both `clear` and TerminalRenderer.CLEAR erase the screen with this sequence
+ERASE_SCREEN = "\033[2J"
+
+
+class StubAgent:
+    """Answers instantly once its model has loaded"""
+
+    name = 'Sakura'
+    wake_word = 'maid'
+    ollama_model = 'stub'
+
+    def __init__(self, load_seconds, warm_up=True, fast=False):
+        self.config = {'fast_mode': fast, 'voice_output': True, 'tts_engine': 'stub'}
+        self.is_sleeping = True
+        self.load_seconds = load_seconds
+        self.can_warm_up = warm_up
+        self.loaded = False
+        self.lock = threading.Lock()
+
+    def load_model(self):
+        with self.lock:
+            if not self.loaded:
+                time.sleep(self.load_seconds)
+                self.loaded = True
+
+    def is_ready(self):
+        return True
+
+    def warm_up(self):
+        if self.can_warm_up:
+            self.load_model()
+
+    def stream_with_agent(self, user_input):
+        self.load_model()
+        yield {"type": "chunk", "text": REPLY}
+        yield {"type": "done", "output": REPLY}
+
+    def get_history(self):
+        return []
+
+    def toggle_thinking(self):
+        return None
+
+
+class SilentPlayer:
+    def play(self, audio_data, sample_rate):
+        pass
+
+    def is_active(self):
+        return False
+
+    def stop(self):
+        pass
+
+
+class LegacyRenderer(TerminalRenderer):
+    """Draws screens the way the CLI did before TerminalRenderer"""
+
+    def _clear(self):
+        # os.system('clear'), but keeping what `clear` prints on the captured screen
+        result = subprocess.run('cls' if os.name == 'nt' else 'clear', shell=True, capture_output=True, text=True)
+        self.stream.write(result.stdout)
+        self.stream.flush()
+
+    def _draw(self, text):
+        self._clear()
+        self.stream.write(text + "\n")
+        self.stream.flush()
+
+    def animate(self, frames, interval=0.5):
+        for frame in frames:
+            self._draw(frame)
+            time.sleep(interval)
+
+    def pause(self, seconds):
+        time.sleep(seconds)
+
+    def prompt_continue(self):
+        input("\nPress Enter to continue...")
+
+
+def show_awake_screen(cli):
+    """What MaidCLI.run draws before asking for the next command."""
+    cli.clear_screen()
+    cli.print_awake_maid(f"Mode: {cli.input_mode}")
+
+
+def run_cli(agent, turns, legacy=False):
+    screen = io.StringIO()
+    # The wake word while sleeping, Enter afterwards
+    answer = lambda prompt="": agent.wake_word if agent.is_sleeping else ""
+
+    with contextlib.redirect_stdout(screen), mock.patch('builtins.input', answer):
+        cli = MaidCLI(agent)
+        if legacy:
+            cli.renderer = LegacyRenderer(stream=screen)
+        cli.voice_output.player = SilentPlayer()
+        cli.input_mode = 'text' # No microphone
+
+        start = time.perf_counter()
+        cli.listen_for_wake_word()
+        show_awake_screen(cli)
+        wake_to_ready = time.perf_counter() - start
+
+        cli.handle_command(QUESTION)
+        show_awake_screen(cli)
+        first_answer = time.perf_counter() - start
+
+        elapsed, visible = [], []
+        for _ in range(turns):
+            turn_start = time.perf_counter()
+            cli.handle_command(QUESTION)
+            show_awake_screen(cli)
+            elapsed.append(time.perf_counter() - turn_start)
+            visible.append(REPLY in screen.getvalue().rsplit(ERASE_SCREEN, 1)[-1])
+
+    keypress = "no" if cli.renderer.fast else "yes"
+    return wake_to_ready, first_answer, sum(elapsed) / turns, keypress, all(visible)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--warm-up-seconds", type=float, default=2.0, help="Simulated model load time.")
+    parser.add_argument("--turns", type=int, default=20, help="Turns to average turn-to-prompt over.")
+    args = parser.parse_args()
+    # `clear` needs a terminal type to know what to print
+    os.environ.setdefault('TERM', 'xterm')
+
+    results = {
+        "before": run_cli(StubAgent(args.warm_up_seconds, warm_up=False), args.turns, legacy=True),
+        "after": run_cli(StubAgent(args.warm_up_seconds), args.turns),
+        "after (fast)": run_cli(StubAgent(args.warm_up_seconds, fast=True), args.turns),
+    }
+
+    print(f"Simulated model load: {args.warm_up_seconds:.1f}s\n")
+    print(f"{'':<14}{'wake-to-ready':>15}{'first answer':>14}{'turn-to-prompt':>16}  Enter keypress  reply visible")
+    for name, (ready, first_answer, turn, keypress, visible) in results.items():
+        print(f"{name:<14}{ready:>14.3f}s{first_answer:>13.3f}s{turn * 1000:>14.3f}ms  {keypress:<14}  "
+              f"{'yes' if visible else 'no'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Load test a running server.py with N simulated clients.
+
+Every client opens its own session and sends its turns one after another,
+like a person at a CLI would. Reports throughput and latency percentiles for
+the first streamed chunk and for the whole answer.
+
+    python3 server.py &
+    python3 benchmarks/bench_server_load.py --clients 8 --turns 3
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+
+import aiohttp
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from src.auth import DEFAULT_TOKEN_FILE, read_token_file
+
+# Conversation only, so the load test never runs tools with side effects
+PROMPTS = [
+    "hii",
+    "How are you today, Sakura?",
+    "Tell me something cute.",
+    "Thank you!",
+]
+
+
+def percentile(values, pct):
+    if not values:
+        return float('nan')
+    values = sorted(values)
+    index = min(len(values) - 1, round(pct / 100 * (len(values) - 1)))
+    return values[index]
+
+
+async def run_client(http, url, turns, results):
+    async with http.post(f'{url}/sessions') as response:
+        session_id = (await response.json())['session_id']
+
+    for turn in range(turns):
+        start = time.perf_counter()
+        first_chunk = None
+        async with http.post(f'{url}/sessions/{session_id}/chat',
+                             json={"input": PROMPTS[turn % len(PROMPTS)]}) as response:
+            if response.status != 200:
+                results['errors'] += 1
+                continue
+            async for line in response.content:
+                if not line.strip():
+                    continue
+                if json.loads(line)["type"] == "chunk" and first_chunk is None:
+                    first_chunk = time.perf_counter() - start
+        results['first_chunk'].append(first_chunk if first_chunk is not None else time.perf_counter() - start)
+        results['total'].append(time.perf_counter() - start)
+
+    await http.delete(f'{url}/sessions/{session_id}')
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://127.0.0.1:8765")
+    parser.add_argument("--clients", type=int, default=8, help="Simulated clients running at once.")
+    parser.add_argument("--turns", type=int, default=3, help="Turns per client.")
+    parser.add_argument("--token-file", default=DEFAULT_TOKEN_FILE, help="Token saved by server.py.")
+    args = parser.parse_args()
+    url = args.url.rstrip('/')
+
+    results = {'first_chunk': [], 'total': [], 'errors': 0}
+    timeout = aiohttp.ClientTimeout(total=None)
+    headers = {"Authorization": f"Bearer {read_token_file(args.token_file)}"}
+    async with aiohttp.ClientSession(timeout=timeout, headers=headers) as http:
+        async with http.get(f'{url}/health') as response:
+            if response.status != 200:
+                print(f"Server refused the load test: {await response.text()}")
+                return
+            health = await response.json()
+        print(f"Model: {health['model']}, max concurrency: {health['max_concurrency']}, "
+              f"{args.clients} clients x {args.turns} turns\n")
+
+        start = time.perf_counter()
+        await asyncio.gather(*(run_client(http, url, args.turns, results) for _ in range(args.clients)))
+        elapsed = time.perf_counter() - start
+
+    done = len(results['total'])
+    print(f"Completed turns: {done}, rejected/failed: {results['errors']}, wall time: {elapsed:.2f}s")
+    print(f"Throughput: {done / elapsed:.2f} turns/s\n")
+    for name in ('first_chunk', 'total'):
+        values = results[name]
+        if not values:
+            continue
+        print(f"{name:<12} mean {statistics.mean(values):.2f}s  p50 {percentile(values, 50):.2f}s  "
+              f"p95 {percentile(values, 95):.2f}s  p99 {percentile(values, 99):.2f}s  max {max(values):.2f}s")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
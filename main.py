@@ -4,11 +4,10 @@ Anime Maid CLI Assistant Agent with LangChain
 A cute command line assistant that uses LangChain for proper tool calling
 """
 
+import argparse
 import os
 import requests
 import sys
-from src.agent import AnimeMaidAgent
-from src.cli import MaidCLI
 
 def check_dependencies():
     """Check for required dependencies."""
@@ -39,19 +38,46 @@ def check_ollama_connection(url='http://localhost:11434'):
 
 def main():
     """Main entry point"""
+    parser = argparse.ArgumentParser(description="Anime Maid CLI Assistant")
+    parser.add_argument('--connect', metavar='URL',
+                        help="Use a running server.py (e.g. http://127.0.0.1:8765) instead of a local agent")
+    parser.add_argument('--token-file', metavar='PATH',
+                        help="Token saved by server.py (default: ~/.maid-san/server_token)")
+    args = parser.parse_args()
+
     print("Setting up Sakura...")
-    
-    if not check_dependencies():
-        return
-        
+
     # Construct the path to the config.json file
     current_dir = os.path.dirname(os.path.abspath(__file__))
     config_path = os.path.join(current_dir, 'config.json')
 
+    # Imported here so the server and the thin client only load what they need
+    from src.cli import MaidCLI
+
+    if args.connect:
+        from src.client import RemoteMaidAgent
+        from src.voice_input import VoiceInput
+        agent = RemoteMaidAgent(args.connect, config_path=config_path, token_file=args.token_file)
+        if not agent.is_ready():
+            print(f"❌ Cannot reach Sakura's server at {args.connect}")
+            print("   Start it with: python3 server.py")
+            print("   and run this client as the same user, so it can read the server's token.")
+            return
+        try:
+            # Voice commands are transcribed by the server's Whisper model
+            MaidCLI(agent, voice_input=VoiceInput(transcriber=agent.transcriber)).run()
+        finally:
+            agent.close()
+        return
+
+    if not check_dependencies():
+        return
+
     if not os.path.exists(config_path):
         print(f"❌ Configuration file not found at '{config_path}'")
         return
 
+    from src.agent import AnimeMaidAgent
     agent = AnimeMaidAgent(config_path=config_path)
     
     if not check_ollama_connection(agent.config.get('ollama_base_url')):
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Anime Maid Agent server
+Hosts one warm agent so many local CLI clients (main.py --connect) can share it
+"""
+
+import argparse
+import os
+from aiohttp import web
+from main import check_dependencies, check_ollama_connection
+from src.auth import DEFAULT_TOKEN_FILE, create_token_file
+
+def main():
+    """Server entry point"""
+    parser = argparse.ArgumentParser(description="Serve Sakura to many local clients")
+    parser.add_argument('--host', default='127.0.0.1',
+                        help="Interface to listen on. Tools run on this machine, so keep it local!")
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--max-concurrency', type=int, default=2,
+                        help="Turns sent to Ollama at the same time")
+    parser.add_argument('--max-waiting', type=int, default=32,
+                        help="Turns allowed to wait for a free slot before clients get 503")
+    parser.add_argument('--session-timeout', type=int, default=3600,
+                        help="Seconds before an idle session is dropped")
+    parser.add_argument('--token-file', default=DEFAULT_TOKEN_FILE,
+                        help="Where to save the token clients must send (readable by you only)")
+    parser.add_argument('--verbose', action='store_true', help="Print the agent's reasoning")
+    args = parser.parse_args()
+
+    print("Setting up Sakura's server...")
+
+    if not check_dependencies():
+        return
+
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+    config_path = os.path.join(current_dir, 'config.json')
+
+    if not os.path.exists(config_path):
+        print(f"❌ Configuration file not found at '{config_path}'")
+        return
+
+    from src.agent import AnimeMaidAgent
+    from src.server import AgentServer
+
+    agent = AnimeMaidAgent(config_path=config_path)
+
+    if not check_ollama_connection(agent.config.get('ollama_base_url')):
+        print(f"   3. Pull model: ollama pull {agent.ollama_model}")
+        return
+
+    if not agent.is_ready():
+        print("❌ Failed to initialize agent.")
+        return
+    agent.agent_executor.verbose = args.verbose
+
+    # A new token every start, so a leaked one stops working after a restart
+    token = create_token_file(args.token_file)
+    server = AgentServer(agent, max_concurrency=args.max_concurrency,
+                         max_waiting=args.max_waiting, session_timeout=args.session_timeout,
+                         token=token, allowed_hosts=[args.host])
+    print(f"🔑 Clients authenticate with the token in {args.token_file}")
+    print(f"🌸 {agent.name} is serving on http://{args.host}:{args.port}")
+    web.run_app(server.create_app(), host=args.host, port=args.port, print=None)
+
+if __name__ == "__main__":
+    main()
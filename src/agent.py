@@ -1,5 +1,7 @@
 import asyncio
 import json
+import queue
+import requests
 import subprocess
 import threading
 import time
@@ -14,12 +16,16 @@ from ddgs.ddgs import DDGS
 
 # LangChain imports
 from langchain.agents import AgentExecutor, create_react_agent
+from langchain.agents.format_scratchpad.tools import format_to_tool_messages
+from langchain.agents.output_parsers.tools import ToolsAgentOutputParser
 from langchain import hub
 from langchain.tools import tool, BaseTool, StructuredTool
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 from langchain_ollama.chat_models import ChatOllama
 from langchain_core.messages import HumanMessage, AIMessage
 from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.exceptions import OutputParserException
+from langchain_core.runnables import RunnablePassthrough
 from langchain.schema import AgentAction, AgentFinish
 
 # Pydantic for structured tool inputs
@@ -60,6 +66,88 @@ class MaidCallbackHandler(BaseCallbackHandler):
     def on_agent_finish(self, finish: AgentFinish, **kwargs):
         print(f"🎯 Final response ready!")
 
+class AnswerStreamHandler(BaseCallbackHandler):
+    """Forwards the final answer to a queue as stream events while it is generated.
+
+    Every LLM call of the agent loop starts over. If the previous call streamed
+    text that turned out not to be the answer (the preamble of a tool call, a
+    ReAct answer that failed to parse), a reset event is sent first.
+    """
+
+    FINAL_ANSWER_MARKER = "Final Answer:"
+
+    def __init__(self, events: queue.Queue, react: bool = True):
+        super().__init__()
+        self.events = events
+        self.react = react
+        self.buffer = ""
+        self.emitted = 0
+        self.text = "" # What this LLM call has streamed so far
+
+    def on_llm_start(self, serialized: Dict[str, Any], prompts: List[str], **kwargs):
+        if self.text:
+            self.events.put({"type": "reset"})
+        self.buffer = ""
+        self.emitted = 0
+        self.text = ""
+
+    def on_llm_new_token(self, token: str, **kwargs):
+        self.buffer += token
+        if self.react:
+            # ReAct output is only the answer after the "Final Answer:" marker
+            marker = self.buffer.find(self.FINAL_ANSWER_MARKER)
+            if marker == -1:
+                return
+            start = marker + len(self.FINAL_ANSWER_MARKER)
+        else:
+            start = 0
+
+        text = self.buffer[max(start, self.emitted):]
+        if not self.text:
+            text = text.lstrip()
+        self.emitted = len(self.buffer)
+        if text:
+            self.text += text
+            self.events.put({"type": "chunk", "text": text})
+
+class MaidToolsAgentOutputParser(ToolsAgentOutputParser):
+    """Tool calling output parser that rejects empty responses.
+
+    Small models sometimes answer with neither text nor a tool call. Raising
+    OutputParserException lets the AgentExecutor hand the error back to the
+    model instead of finishing with an empty answer. Tool calls whose
+    arguments are not valid JSON never reach the parser: ChatOllama raises
+    OutputParserException for them itself.
+    """
+
+    def parse_result(self, result, *, partial: bool = False):
+        message = result[0].message
+        if not message.tool_calls and not str(message.content).strip():
+            error = "Empty response. Call a tool or answer Master directly."
+            raise OutputParserException(error, observation=error, llm_output=str(message.content), send_to_llm=True)
+        return super().parse_result(result, partial=partial)
+
+def tool_calling_parsing_error(error: OutputParserException) -> str:
+    """Explain to the model why its last tool calling response was unusable."""
+    observation = error.observation if error.send_to_llm else str(error)
+    return f"Your last response could not be used: {observation}"
+
+def format_tool_calling_scratchpad(intermediate_steps) -> List:
+    """Like format_to_tool_messages, but reports parsing errors as feedback.
+
+    format_to_tool_messages turns the AgentExecutor's `_Exception` steps into
+    an AIMessage holding the error, so the model would read it as something
+    it said itself and carry on from there. Here the error is sent back as a
+    HumanMessage instead.
+    """
+    messages = []
+    for action, observation in intermediate_steps:
+        if action.tool == "_Exception":
+            messages.append(HumanMessage(content=str(observation)))
+        else:
+            messages.extend(m for m in format_to_tool_messages([(action, observation)]) if m not in messages)
+    return messages
+
 # ------------------------------- 
 # Structured tool inputs
 # ------------------------------- 
@@ -74,7 +162,7 @@ class PlayMusicSpotifyInput(BaseModel):
 
 class FindFilesInput(BaseModel):
     pattern: str = Field(description="The glob pattern to search for (e.g., '*.txt', 'data/**/*.csv').")
-    path: Optional[str] = Field(description="The directory to start the search from. Defaults to the current directory.")
+    path: Optional[str] = Field(default=None, description="The directory to start the search from. Defaults to the current directory.")
 
 class SearchInFileInput(BaseModel):
     pattern: str = Field(description="The text pattern to search for inside the content of a specific file.")
@@ -95,6 +183,7 @@ class AnimeMaidAgent:
         self.ollama_model = self.config.get('ollama_model', 'llama3.1:8b')
         self.show_thinking = self.config.get('show_thinking', False)
         self.user_home_prefix = self.config.get('user_home_prefix', '/home/zimer')
+        self.agent_mode = self.config.get('agent_mode', 'react') # 'react' or 'tool_calling'
         
         self.agent = None
         self.agent_executor = None
@@ -231,7 +320,7 @@ class AnimeMaidAgent:
     # Tools List
     # ------------------------------- 
     def get_tools(self) -> List[BaseTool]:
-        return [
+        tools = [
             StructuredTool.from_function(
                 func=self.search_internet_impl,
                 name="search_internet",
@@ -279,26 +368,18 @@ class AnimeMaidAgent:
                 args_schema=ExecuteShellCommandInput
             )
         ]
+        for maid_tool in tools:
+            # Report bad arguments back to the model instead of failing the whole turn
+            maid_tool.handle_validation_error = True
+            maid_tool.handle_tool_error = True
+        return tools
 
     # ------------------------------- 
     # Agent Setup
     # ------------------------------- 
-    def setup_agent(self):
-        """Initialize the LangChain agent using the ReAct framework."""
-        try:
-            llm = ChatOllama(
-                model=self.ollama_model,
-                temperature=self.config.get('temperature', 0.7),
-                base_url=self.config.get('ollama_base_url', 'http://localhost:11434')
-            )
-            
-            tools = self.get_tools()
-            
-            # Get the ReAct prompt from the hub
-            prompt = hub.pull("hwchase17/react-chat")
-
-            # Inject the maid persona into the system message
-            maid_persona_prompt = self.config.get('prompt_template', '''
+    def get_persona_prompt(self) -> str:
+        """Return the maid persona used as the system message."""
+        return self.config.get('prompt_template', '''
             You are Sakura, a cute and helpful anime maid assistant! 🌸
 
             Your personality:
@@ -313,10 +394,65 @@ class AnimeMaidAgent:
             - When asked for information, you must use your tools to find it.
             - If you do not have a tool, politely say you cannot answer.
             ''')
+
+    def build_react_agent(self, llm, tools):
+        """Build a ReAct agent that parses tool calls out of free text."""
+        # Get the ReAct prompt from the hub
+        prompt = hub.pull("hwchase17/react-chat")
+
+        # Inject the maid persona into the system message
+        prompt.template = self.get_persona_prompt() + "\n\n" + prompt.template
+
+        return create_react_agent(llm, tools, prompt)
+
+    def build_tool_calling_agent(self, llm, tools):
+        """Build an agent that uses Ollama's native tool calling.
+
+        The tools are bound to the model through `bind_tools`, so their
+        pydantic `*Input` schemas are sent to Ollama and tool calls come back
+        as structured data instead of ReAct text. Ollama does not enforce the
+        schemas while decoding, so malformed calls are still possible; the
+        errors go back to the model through format_tool_calling_scratchpad,
+        and bad arguments through the tools' validation error handling.
+        """
+        prompt = ChatPromptTemplate.from_messages([
+            ("system", self.get_persona_prompt()),
+            MessagesPlaceholder(variable_name="chat_history"),
+            ("human", "{input}"),
+            MessagesPlaceholder(variable_name="agent_scratchpad"),
+        ])
+
+        # Same pipeline as create_tool_calling_agent, with the stricter output parser
+        # and error feedback
+        return (
+            RunnablePassthrough.assign(
+                agent_scratchpad=lambda x: format_tool_calling_scratchpad(x["intermediate_steps"])
+            )
+            | prompt
+            | llm.bind_tools(tools)
+            | MaidToolsAgentOutputParser()
+        )
+
+    def setup_agent(self):
+        """Initialize the LangChain agent for the configured `agent_mode`."""
+        # Never leave an agent for a different mode behind if setup fails
+        self.agent = None
+        self.agent_executor = None
+        try:
+            llm = ChatOllama(
+                model=self.ollama_model,
+                temperature=self.config.get('temperature', 0.7),
+                base_url=self.config.get('ollama_base_url', 'http://localhost:11434')
+            )
             
-            prompt.template = maid_persona_prompt + "\n\n" + prompt.template
+            tools = self.get_tools()
 
-            self.agent = create_react_agent(llm, tools, prompt)
+            if self.agent_mode == 'tool_calling':
+                self.agent = self.build_tool_calling_agent(llm, tools)
+            elif self.agent_mode == 'react':
+                self.agent = self.build_react_agent(llm, tools)
+            else:
+                raise ValueError(f"Unknown agent_mode '{self.agent_mode}', expected 'react' or 'tool_calling'.")
             
             self.callback_handler = MaidCallbackHandler(show_thinking=self.show_thinking)
             
@@ -324,35 +460,95 @@ class AnimeMaidAgent:
                 agent=self.agent,
                 tools=tools,
                 verbose=True,
-                handle_parsing_errors=True,
+                # ChatOllama's own errors for malformed tool calls are not marked
+                # send_to_llm, so tool calling explains them to the model itself
+                handle_parsing_errors=tool_calling_parsing_error if self.agent_mode == 'tool_calling' else True,
                 callbacks=[self.callback_handler]
             )
             
         except Exception as e:
-            print(f"Error setting up ReAct agent: {e}")
+            print(f"Error setting up {self.agent_mode} agent: {e}")
             print("Make sure Ollama is running and the model is available!")
 
     # ------------------------------- 
     # Run Agent
     # ------------------------------- 
-    def process_with_agent(self, user_input: str) -> str:
-        """Process user input through the LangChain agent"""
+    def is_ready(self) -> bool:
+        """Whether the agent was set up and can answer."""
+        return self.agent_executor is not None
+
+    def toggle_thinking(self) -> bool:
+        """Toggle verbose agent output, returning the new state."""
+        self.agent_executor.verbose = not self.agent_executor.verbose
+        return self.agent_executor.verbose
+
+    def get_history(self, chat_history: Optional[list] = None) -> List[Dict[str, str]]:
+        """Return a conversation as a list of {"role", "content"} dicts."""
+        if chat_history is None:
+            chat_history = self.chat_history
+        return [{"role": message.type, "content": message.content} for message in chat_history]
+
+    def warm_up(self):
+        """Ask Ollama to load the model into memory so the first answer is not delayed."""
+        base_url = self.config.get('ollama_base_url', 'http://localhost:11434')
+        try:
+            # A generate request without a prompt only loads the model
+            requests.post(f'{base_url}/api/generate', json={"model": self.ollama_model}, timeout=120)
+        except requests.exceptions.RequestException:
+            pass
+
+    def process_with_agent(self, user_input: str, callbacks: Optional[List[BaseCallbackHandler]] = None,
+                           chat_history: Optional[list] = None) -> str:
+        """Process user input through the LangChain agent.
+
+        `chat_history` lets several conversations share this agent; it defaults
+        to the agent's own history.
+        """
+        if chat_history is None:
+            chat_history = self.chat_history
         try:
             if not self.agent_executor:
                 return "An internal error occurred: agent not initialized."
             
             # Add user input to chat history
-            self.chat_history.append(HumanMessage(content=user_input))
+            chat_history.append(HumanMessage(content=user_input))
 
             response = self.agent_executor.invoke({
                 "input": user_input,
-                "chat_history": self.chat_history,
+                "chat_history": chat_history,
                 "user_home_prefix": self.user_home_prefix
-            }, callbacks=[self.callback_handler])
+            }, callbacks=[self.callback_handler] + (callbacks or []))
             
             # Add AI response to chat history
-            self.chat_history.append(AIMessage(content=response["output"]))
+            chat_history.append(AIMessage(content=response["output"]))
             
             return response["output"]
         except Exception as e:
-            return f"An internal error occurred: {str(e)}"
\ No newline at end of file
+            return f"An internal error occurred: {str(e)}"
+
+    def stream_with_agent(self, user_input: str, chat_history: Optional[list] = None):
+        """Process user input through the agent, yielding stream events.
+
+        Yields {"type": "chunk", "text"} while the answer streams in and
+        {"type": "reset"} when the text streamed so far should be discarded.
+        Ends with {"type": "done", "output"}, whose output is the authoritative answer.
+        """
+        events = queue.Queue()
+        handler = AnswerStreamHandler(events, react=self.agent_mode == 'react')
+        result = {}
+
+        def run():
+            result["output"] = self.process_with_agent(user_input, callbacks=[handler], chat_history=chat_history)
+            events.put(None)
+
+        threading.Thread(target=run, daemon=True).start()
+        while (event := events.get()) is not None:
+            yield event
+
+        # Errors and answers the model never marked as final were not streamed as they are
+        output = result["output"]
+        if " ".join(handler.text.split()) != " ".join(output.split()):
+            if handler.text:
+                yield {"type": "reset"}
+            yield {"type": "chunk", "text": output}
+        yield {"type": "done", "output": output}
@@ -0,0 +1,28 @@
+# src/auth.py
+import os
+import secrets
+
+# Only the user running server.py can read this file, so only they (and their
+# thin clients) can talk to the server, whose tools run shell commands as them
+DEFAULT_TOKEN_FILE = os.path.join(os.path.expanduser('~'), '.maid-san', 'server_token')
+
+def create_token_file(path=DEFAULT_TOKEN_FILE) -> str:
+    """Write a new random token to `path`, readable by its owner only, and return it."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+    token = secrets.token_urlsafe(32)
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, 'w') as f:
+        # The file may have existed with looser permissions
+        os.chmod(path, 0o600)
+        f.write(token)
+    return token
+
+def read_token_file(path=DEFAULT_TOKEN_FILE):
+    """Return the token saved by the server, or None if it cannot be read."""
+    try:
+        with open(path, 'r') as f:
+            return f.read().strip() or None
+    except OSError:
+        return None
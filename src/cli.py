@@ -1,19 +1,40 @@
 # -*- coding: utf-8 -*-
 import time
-import os
 import threading
-from .agent import AnimeMaidAgent
+from typing import TYPE_CHECKING, Optional, Union
 from .voice_input import VoiceInput
+from .voice_output import VoiceOutput
+from .renderer import TerminalRenderer
+
+if TYPE_CHECKING:
+    # Only for annotations, so the thin client never loads LangChain
+    from .agent import AnimeMaidAgent
+    from .client import RemoteMaidAgent
 
 class MaidCLI:
-    def __init__(self, agent: AnimeMaidAgent):
+    def __init__(self, agent: Union["AnimeMaidAgent", "RemoteMaidAgent"], voice_input: Optional[VoiceInput] = None):
         self.agent = agent
-        self.voice_input = VoiceInput()
+        self.renderer = TerminalRenderer(fast=self.agent.config.get('fast_mode', False))
+        self.voice_output = VoiceOutput(
+            engine=self.agent.config.get('tts_engine', 'pyttsx3'),
+            enabled=self.agent.config.get('voice_output', True)
+        )
+        self.voice_input = voice_input or VoiceInput()
+        self.voice_output.on_first_audio = self.start_barge_in
         self.input_mode = 'voice' # Default to voice input
 
+    def start_barge_in(self):
+        """Let Master interrupt a reply by speaking over it (voice mode only).
+
+        Called as soon as the reply starts playing, while the rest of the
+        answer may still be streaming in.
+        """
+        if self.input_mode == 'voice':
+            self.voice_input.monitor_barge_in(self.voice_output.is_speaking, self.voice_output.stop)
+
     def clear_screen(self):
         """Clear the terminal screen"""
-        os.system('cls' if os.name == 'nt' else 'clear')
+        self.renderer.clear()
 
     def print_sleeping_maid(self):
         """Display sleeping maid ASCII art"""
@@ -45,7 +66,9 @@ class MaidCLI:
         print(awake_art)
 
     def animate_wake_up(self):
-        """Animate the wake up sequence"""
+        """Animate the wake up sequence while the model warms up in the background"""
+        threading.Thread(target=self.agent.warm_up, daemon=True).start()
+
         wake_frames = [
             r'''
     ╭─────────────────────────╮
@@ -76,13 +99,10 @@ class MaidCLI:
             '''
         ]
         
-        for frame in wake_frames:
-            self.clear_screen()
-            print(frame)
-            time.sleep(0.5)
+        self.renderer.animate(wake_frames, interval=0.5)
 
     def listen_for_wake_word(self):
-        """Listen for wake word in a separate thread"""
+        """Wait until the wake word is typed"""
         while True:
             if self.agent.is_sleeping:
                 try:
@@ -97,8 +117,10 @@ class MaidCLI:
 
     def toggle_thinking_mode(self):
         """Toggle thinking mode on/off"""
-        self.agent.agent_executor.verbose = not self.agent.agent_executor.verbose
-        status = "enabled" if self.agent.agent_executor.verbose else "disabled"
+        enabled = self.agent.toggle_thinking()
+        if enabled is None:
+            return "Thinking mode is only available when I run on this machine, Master."
+        status = "enabled" if enabled else "disabled"
         return f"Thinking mode is now {status}!"
 
     def display_help(self):
@@ -146,7 +168,7 @@ class MaidCLI:
         elif user_input.lower() in ['sleep', 'rest']:
             print(f"\n🌸 {self.agent.name}: Good night Master! Call me when you need me... 💤")
             self.agent.is_sleeping = True
-            time.sleep(2)
+            self.renderer.pause(2)
         
         elif user_input.lower() in ['help']:
             self.display_help()
@@ -155,24 +177,38 @@ class MaidCLI:
             self.clear_screen()
             self.print_awake_maid("Conversation History")
             print("\n📜 Here's our chat history, Master:\n")
-            if not self.agent.chat_history:
+            history = self.agent.get_history()
+            if not history:
                 print("   (No history yet, Master. Let's start a conversation!)\n")
             else:
-                from langchain_core.messages import HumanMessage, AIMessage
-                for message in self.agent.chat_history:
-                    if isinstance(message, HumanMessage):
-                        print(f"   Master: {message.content}")
-                    elif isinstance(message, AIMessage):
-                        print(f"   🌸 {self.agent.name}: {message.content}")
+                for message in history:
+                    if message["role"] == "human":
+                        print(f"   Master: {message['content']}")
+                    elif message["role"] == "ai":
+                        print(f"   🌸 {self.agent.name}: {message['content']}")
                 print()
 
         else:
             print("\n🤔 Thinking...")
-            response = self.agent.process_with_agent(user_input)
+            self.voice_output.begin(time.perf_counter())
+            response = ""
+            for event in self.agent.stream_with_agent(user_input):
+                if event["type"] == "chunk":
+                    self.voice_output.feed(event["text"])
+                elif event["type"] == "reset":
+                    self.voice_output.discard()
+                elif event["type"] == "done":
+                    response = event["output"]
+            self.voice_output.flush()
             print(f"\n🌸 {self.agent.name}: {response}")
+
+            # Returns once the reply starts playing, or as soon as it is clear it never will
+            time_to_first_audio = self.voice_output.wait_for_first_audio()
+            if time_to_first_audio is not None:
+                print(f"🔊 Time to first audio: {time_to_first_audio:.2f}s")
         
         # Pause for user to see the response
-        input("\nPress Enter to continue...")
+        self.renderer.prompt_continue()
         return True
 
     def run(self):
@@ -181,7 +217,7 @@ class MaidCLI:
         print(f"Type '{self.agent.wake_word}' to wake her up, 'quit' to exit, or 'help' for commands")
         print()
         
-        if not self.agent.agent_executor:
+        if not self.agent.is_ready():
             print("❌ Failed to initialize agent. Please check:")
             print("   1. Ollama is running: ollama serve")
             print(f"   2. Model is available: ollama pull {self.agent.ollama_model}")
@@ -192,11 +228,9 @@ class MaidCLI:
                 if self.agent.is_sleeping:
                     self.clear_screen()
                     self.print_sleeping_maid()
-                    wake_thread = threading.Thread(target=self.listen_for_wake_word)
-                    wake_thread.daemon = True
-                    wake_thread.start()
-                    while self.agent.is_sleeping:
-                        time.sleep(0.5)
+                    self.listen_for_wake_word()
+                    if self.agent.is_sleeping:
+                        break # Input closed before the wake word
                 
                 else:
                     self.clear_screen()
@@ -205,16 +239,18 @@ class MaidCLI:
                     user_input = ""
                     if self.input_mode == 'voice':
                         try:
+                            # Don't record Sakura's own voice as Master's command
+                            self.voice_output.wait_until_done()
                             user_input = self.voice_input.listen()
                             print(f"\nMaster, you said: {user_input}")
                             if user_input.strip().lower() == 'text mode':
                                 self.input_mode = 'text'
                                 print("\n🌸 Switched to text input mode.")
-                                input("\nPress Enter to continue...")
+                                self.renderer.prompt_continue()
                                 continue
                         except Exception as e:
                             print(f"\nSorry Master, I had trouble with voice input: {e}")
-                            input("\nPress Enter to continue...")
+                            self.renderer.prompt_continue()
                             continue
                     else: # text mode
                         try:
@@ -222,7 +258,7 @@ class MaidCLI:
                             if user_input.lower() == 'voice mode':
                                 self.input_mode = 'voice'
                                 print("\n🌸 Switched to voice input mode.")
-                                input("\nPress Enter to continue...")
+                                self.renderer.prompt_continue()
                                 continue
                         except (KeyboardInterrupt, EOFError):
                             break
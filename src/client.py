@@ -0,0 +1,149 @@
+# src/client.py
+import json
+import requests
+from typing import Optional, Dict, Any, List
+
+from .auth import DEFAULT_TOKEN_FILE, read_token_file
+
+class RemoteTranscriber:
+    """Sends recorded voice commands to the server's shared Whisper model"""
+
+    def __init__(self, server_url: str, http: Optional[requests.Session] = None):
+        self.server_url = server_url.rstrip('/')
+        self.http = http or requests.Session()
+
+    def transcribe(self, filename):
+        try:
+            with open(filename, 'rb') as f:
+                response = self.http.post(f'{self.server_url}/transcribe', data=f.read(),
+                                         headers={"Content-Type": "audio/wav"}, timeout=(5, None))
+            response.raise_for_status()
+            return response.json()['text']
+        except (requests.exceptions.RequestException, OSError, ValueError, KeyError) as e:
+            return f"Error during transcription: {str(e)}"
+
+class RemoteMaidAgent:
+    """Stands in for AnimeMaidAgent by talking to a running `server.py`.
+
+    It offers the methods MaidCLI needs, so the CLI can run as a thin client
+    without loading LangChain, Whisper or the model itself. Voice commands are
+    transcribed on the server through `transcriber`. Every request carries the
+    token the server saved to `token_file`.
+    """
+
+    def __init__(self, server_url: str, config_path='config.json', token_file=None):
+        self.server_url = server_url.rstrip('/')
+        self.http = requests.Session()
+        token = read_token_file(token_file or DEFAULT_TOKEN_FILE)
+        if token:
+            self.http.headers["Authorization"] = f"Bearer {token}"
+        self.config = self.load_config(config_path)
+        self.is_sleeping = True
+        self.wake_word = self.config.get('wake_word', 'maid')
+        self.name = self.config.get('name', 'Sakura')
+        self.ollama_model = self.config.get('ollama_model', 'llama3.1:8b')
+        self.transcriber = RemoteTranscriber(self.server_url, self.http)
+        self.session_id = None
+
+        try:
+            response = self.http.get(f'{self.server_url}/health', timeout=5)
+            response.raise_for_status()
+            health = response.json()
+            self.name = health.get('name', self.name)
+            self.ollama_model = health.get('model', self.ollama_model)
+            if health.get('ready'):
+                self.create_session()
+        except (requests.exceptions.RequestException, ValueError):
+            pass
+
+    def load_config(self, path: str) -> Dict[str, Any]:
+        """Load configuration from a JSON file."""
+        try:
+            with open(path, 'r') as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    @property
+    def session_url(self) -> str:
+        return f'{self.server_url}/sessions/{self.session_id}'
+
+    def create_session(self):
+        """Start a new conversation on the server."""
+        response = self.http.post(f'{self.server_url}/sessions', timeout=5)
+        response.raise_for_status()
+        self.session_id = response.json()['session_id']
+
+    def close(self):
+        """End the conversation so the server can free it right away."""
+        if self.session_id is None:
+            return
+        try:
+            self.http.delete(self.session_url, timeout=5)
+        except requests.exceptions.RequestException:
+            pass
+        self.session_id = None
+
+    def is_ready(self) -> bool:
+        """Whether the server is reachable and gave us a session."""
+        return self.session_id is not None
+
+    def toggle_thinking(self) -> Optional[bool]:
+        """Thinking mode prints on the server, so it cannot be toggled from here."""
+        return None
+
+    def get_history(self) -> List[Dict[str, str]]:
+        """Return this session's conversation as a list of {"role", "content"} dicts."""
+        try:
+            response = self.http.get(f'{self.session_url}/history', timeout=5)
+            if response.status_code == 404:
+                # The server restarted or dropped our idle session
+                self.create_session()
+                return []
+            response.raise_for_status()
+            return response.json()
+        except requests.exceptions.RequestException:
+            return []
+
+    def warm_up(self):
+        """Ask the server to load the model into memory."""
+        try:
+            self.http.post(f'{self.server_url}/warm_up', timeout=5)
+        except requests.exceptions.RequestException:
+            pass
+
+    def stream_with_agent(self, user_input: str):
+        """Send user input to the server, yielding the answer's stream events"""
+        try:
+            response = self._post_chat(user_input)
+            if response.status_code == 404:
+                # The server restarted or dropped our idle session, start a new one
+                response.close()
+                self.create_session()
+                response = self._post_chat(user_input)
+
+            with response:
+                if response.status_code != 200:
+                    yield {"type": "chunk", "text": response.text}
+                    yield {"type": "done", "output": response.text}
+                    return
+                for line in response.iter_lines():
+                    if line:
+                        yield json.loads(line)
+        except requests.exceptions.RequestException as e:
+            error = f"An internal error occurred: {str(e)}"
+            yield {"type": "chunk", "text": error}
+            yield {"type": "done", "output": error}
+
+    def process_with_agent(self, user_input: str) -> str:
+        """Send user input to the server and return the whole answer"""
+        output = ""
+        for event in self.stream_with_agent(user_input):
+            if event["type"] == "done":
+                output = event["output"]
+        return output
+
+    def _post_chat(self, user_input: str):
+        # No read timeout, the answer may queue behind other clients
+        return self.http.post(f'{self.session_url}/chat', json={"input": user_input},
+                             stream=True, timeout=(5, None))
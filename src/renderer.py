@@ -0,0 +1,115 @@
+# src/renderer.py
+import os
+import sys
+import threading
+import time
+
+class TerminalRenderer:
+    """Draws screens with ANSI escape codes instead of shelling out to `clear`.
+
+    Animations play on a background thread so the caller can do real work
+    (like warming up the model) meanwhile. Anything drawn afterwards waits for
+    the running animation to finish first, so frames never interleave.
+    In fast mode animations jump to their last frame and pauses are skipped;
+    instead of waiting for Enter, a response is kept on screen by skipping
+    the next clear.
+
+    Windows consoles only understand ANSI escape codes once virtual terminal
+    processing is on; if it cannot be turned on, screens are cleared with
+    `cls` like before.
+    """
+
+    # Clear screen and move cursor home; scrollback is kept
+    CLEAR = "\033[2J\033[H"
+
+    def __init__(self, fast=False, stream=None):
+        self.fast = fast
+        self.stream = stream or sys.stdout
+        self.animation = None
+        self.keep_screen = False
+        self.ansi = self.enable_ansi()
+
+    def enable_ansi(self) -> bool:
+        """Make sure escape codes written to the console are interpreted."""
+        if os.name != 'nt' or self.stream is not sys.stdout or not self.stream.isatty():
+            return True
+        try:
+            import ctypes
+            kernel32 = ctypes.windll.kernel32
+            handle = kernel32.GetStdHandle(-11) # STD_OUTPUT_HANDLE
+            mode = ctypes.c_uint32()
+            if not kernel32.GetConsoleMode(handle, ctypes.byref(mode)):
+                return False
+            # ENABLE_VIRTUAL_TERMINAL_PROCESSING, on by default in Windows Terminal
+            return bool(mode.value & 0x0004 or kernel32.SetConsoleMode(handle, mode.value | 0x0004))
+        except (AttributeError, OSError):
+            return False
+
+    def wait(self):
+        """Block until the running animation, if any, has finished."""
+        if self.animation and self.animation is not threading.current_thread():
+            self.animation.join()
+        self.animation = None
+
+    def clear(self):
+        """Clear the terminal screen, unless a response has to stay readable"""
+        self.wait()
+        if self.keep_screen:
+            self.keep_screen = False
+            self.stream.write("\n")
+            self.stream.flush()
+            return
+        self._clear()
+
+    def draw(self, text):
+        """Replace the screen contents with `text`."""
+        self.wait()
+        self._draw(text)
+
+    def animate(self, frames, interval=0.5):
+        """Play `frames` in the background, `interval` seconds apart."""
+        self.wait()
+        if self.fast:
+            self._draw(frames[-1])
+            return
+        self.animation = threading.Thread(target=self._play, args=(frames, interval), daemon=True)
+        self.animation.start()
+
+    def pause(self, seconds):
+        """Sleep so a message can be read, unless in fast mode."""
+        if not self.fast:
+            time.sleep(seconds)
+
+    def prompt_continue(self):
+        """Wait for Enter so a response can be read.
+
+        In fast mode there is no wait; the response stays on screen and the
+        next screen is drawn below it.
+        """
+        if self.fast:
+            self.keep_screen = True
+        else:
+            input("\nPress Enter to continue...")
+
+    def _clear(self):
+        if not self.ansi:
+            self.stream.flush()
+            os.system('cls')
+            return
+        self.stream.write(self.CLEAR)
+        self.stream.flush()
+
+    def _draw(self, text):
+        if not self.ansi:
+            self._clear()
+            self.stream.write(text + "\n")
+            self.stream.flush()
+            return
+        self.stream.write(self.CLEAR + text + "\n")
+        self.stream.flush()
+
+    def _play(self, frames, interval):
+        for i, frame in enumerate(frames):
+            if i:
+                time.sleep(interval)
+            self._draw(frame)
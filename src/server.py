@@ -0,0 +1,275 @@
+# src/server.py
+import asyncio
+import json
+import os
+import secrets
+import tempfile
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from aiohttp import web, WSMsgType
+
+from .agent import AnimeMaidAgent
+from .transcriber import WhisperTranscriber
+
+class Session:
+    """One client's conversation with the shared agent"""
+
+    def __init__(self):
+        self.id = uuid.uuid4().hex
+        self.chat_history = []
+        self.lock = asyncio.Lock() # A session runs one turn at a time
+        self.last_active = time.monotonic()
+
+class RequestQueue:
+    """Limits how many turns run against Ollama at once.
+
+    Turns beyond `max_concurrency` wait for a free slot; when no slot is free
+    and `max_waiting` turns are already waiting, new ones are rejected with 503.
+    """
+
+    def __init__(self, max_concurrency=2, max_waiting=32):
+        self.max_concurrency = max_concurrency
+        self.max_waiting = max_waiting
+        self.slots = asyncio.Semaphore(max_concurrency)
+        self.waiting = 0
+        self.active = 0
+
+    async def acquire(self):
+        """Wait for a free slot. Every successful acquire() needs one release()."""
+        if self.slots.locked() and self.waiting >= self.max_waiting:
+            raise web.HTTPServiceUnavailable(text="Sakura is busy right now, Master. Please try again later.")
+        self.waiting += 1
+        try:
+            await self.slots.acquire()
+        finally:
+            self.waiting -= 1
+        self.active += 1
+
+    def release(self):
+        self.active -= 1
+        self.slots.release()
+
+class AgentServer:
+    """Hosts one warm AnimeMaidAgent behind a local HTTP/WebSocket API.
+
+    Routes:
+        GET    /health                      server and queue status
+        POST   /sessions                    create a session, returns {"session_id"}
+        DELETE /sessions/{id}               end a session
+        GET    /sessions/{id}/history       the session's chat history
+        POST   /sessions/{id}/chat          {"input": "..."}, streams the answer events as JSON lines
+        GET    /sessions/{id}/ws            WebSocket, send input text, receive the answer events as JSON
+        POST   /transcribe                  WAV audio in the body, returns {"text"}
+        POST   /warm_up                     load the model into Ollama's memory
+
+    Answer events are the ones AnimeMaidAgent.stream_with_agent yields
+    (chunk, reset, done), plus {"type": "error"} over the WebSocket.
+
+    The agent's tools run shell commands as the server's user, so every
+    request must carry `Authorization: Bearer <token>`, and requests whose
+    Host is not one of `allowed_hosts` or that come from a web page (an
+    Origin header) are refused. This keeps out other users on the machine
+    and DNS rebinding attacks from pages open in a local browser.
+    """
+
+    LOOPBACK_HOSTS = {"127.0.0.1", "localhost", "::1"}
+
+    # Voice commands are uploaded as 16 kHz mono WAV, about 2 MB per minute
+    MAX_UPLOAD_SIZE = 20 * 1024 * 1024
+
+    def __init__(self, agent: AnimeMaidAgent, max_concurrency=2, max_waiting=32, session_timeout=3600,
+                 transcriber=None, token=None, allowed_hosts=()):
+        self.agent = agent
+        self.token = token or secrets.token_urlsafe(32)
+        self.allowed_hosts = self.LOOPBACK_HOSTS | set(allowed_hosts)
+        # One Whisper model for every client, loaded on the first voice command
+        self.transcriber = transcriber or WhisperTranscriber()
+        self.sessions = {}
+        self.session_timeout = session_timeout
+        self.queue = RequestQueue(max_concurrency, max_waiting)
+        # One worker per slot, each drives a single streamed turn
+        self.executor = ThreadPoolExecutor(max_workers=max_concurrency)
+        self.reaper = None
+        self.turns = set() # Running turn tasks, referenced so they are not garbage collected
+
+    def create_app(self) -> web.Application:
+        app = web.Application(client_max_size=self.MAX_UPLOAD_SIZE, middlewares=[self.check_access])
+        app.add_routes([
+            web.get('/health', self.health),
+            web.post('/sessions', self.create_session),
+            web.delete('/sessions/{session_id}', self.delete_session),
+            web.get('/sessions/{session_id}/history', self.history),
+            web.post('/sessions/{session_id}/chat', self.chat),
+            web.get('/sessions/{session_id}/ws', self.websocket),
+            web.post('/transcribe', self.transcribe),
+            web.post('/warm_up', self.warm_up),
+        ])
+        app.on_startup.append(self.on_startup)
+        app.on_cleanup.append(self.on_cleanup)
+        return app
+
+    # -------------------------------
+    # Lifecycle
+    # -------------------------------
+    async def on_startup(self, app):
+        loop = asyncio.get_running_loop()
+        loop.run_in_executor(None, self.agent.warm_up)
+        self.reaper = asyncio.create_task(self.expire_sessions())
+
+    async def on_cleanup(self, app):
+        if self.reaper:
+            self.reaper.cancel()
+        self.executor.shutdown(wait=False)
+
+    async def expire_sessions(self):
+        """Drop sessions that have been idle for longer than `session_timeout`."""
+        while True:
+            await asyncio.sleep(60)
+            now = time.monotonic()
+            for session_id, session in list(self.sessions.items()):
+                if now - session.last_active > self.session_timeout and not session.lock.locked():
+                    del self.sessions[session_id]
+
+    # -------------------------------
+    # Helpers
+    # -------------------------------
+    @web.middleware
+    async def check_access(self, request, handler):
+        """Refuse requests from browsers, foreign Host names and clients without the token."""
+        if request.url.host not in self.allowed_hosts:
+            raise web.HTTPForbidden(text="Unexpected Host header.")
+        if request.headers.get('Origin') is not None:
+            raise web.HTTPForbidden(text="Requests from web pages are not allowed.")
+        scheme, _, token = request.headers.get('Authorization', '').partition(' ')
+        if scheme.lower() != 'bearer' or not secrets.compare_digest(token.strip().encode(), self.token.encode()):
+            raise web.HTTPUnauthorized(text="Missing or wrong token. Run the client as the same user as the server.")
+        return await handler(request)
+
+    def get_session(self, request) -> Session:
+        session = self.sessions.get(request.match_info['session_id'])
+        if session is None:
+            raise web.HTTPNotFound(text="Unknown session.")
+        session.last_active = time.monotonic()
+        return session
+
+    async def start_turn(self, session: Session, user_input: str) -> asyncio.Queue:
+        """Start a turn and return the queue its stream events arrive on (None at the end).
+
+        The turn runs as its own task, holding the session lock and a queue
+        slot until the agent has finished. A client that disconnects halfway
+        through an answer therefore still counts against max_concurrency until
+        Ollama is done with it. Raises 503 if too many turns are waiting.
+        """
+        await session.lock.acquire()
+        try:
+            await self.queue.acquire()
+        except BaseException:
+            session.lock.release()
+            raise
+        events = asyncio.Queue()
+        task = asyncio.create_task(self.run_turn(session, user_input, events))
+        self.turns.add(task)
+        task.add_done_callback(self.turns.discard)
+        return events
+
+    async def run_turn(self, session: Session, user_input: str, events: asyncio.Queue):
+        """Drive one turn on a worker thread, forwarding its stream events."""
+        loop = asyncio.get_running_loop()
+        try:
+            agent_events = self.agent.stream_with_agent(user_input, chat_history=session.chat_history)
+            while (event := await loop.run_in_executor(self.executor, next, agent_events, None)) is not None:
+                events.put_nowait(event)
+        finally:
+            session.last_active = time.monotonic()
+            self.queue.release()
+            session.lock.release()
+            events.put_nowait(None)
+
+    def transcribe_wav(self, audio: bytes) -> str:
+        fd, filename = tempfile.mkstemp(prefix="maid_san_upload_", suffix=".wav")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(audio)
+            return self.transcriber.transcribe(filename)
+        finally:
+            try:
+                os.remove(filename)
+            except OSError:
+                pass
+
+    # -------------------------------
+    # Routes
+    # -------------------------------
+    async def health(self, request):
+        return web.json_response({
+            "status": "ok",
+            "ready": self.agent.is_ready(),
+            "name": self.agent.name,
+            "model": self.agent.ollama_model,
+            "sessions": len(self.sessions),
+            "active": self.queue.active,
+            "waiting": self.queue.waiting,
+            "max_concurrency": self.queue.max_concurrency,
+        })
+
+    async def create_session(self, request):
+        session = Session()
+        self.sessions[session.id] = session
+        return web.json_response({"session_id": session.id}, status=201)
+
+    async def delete_session(self, request):
+        session = self.get_session(request)
+        del self.sessions[session.id]
+        return web.Response(status=204)
+
+    async def history(self, request):
+        session = self.get_session(request)
+        return web.json_response(self.agent.get_history(session.chat_history))
+
+    async def chat(self, request):
+        session = self.get_session(request)
+        try:
+            data = await request.json()
+        except json.JSONDecodeError:
+            raise web.HTTPBadRequest(text="Expected a JSON body.")
+        user_input = str(data.get("input", "")).strip()
+        if not user_input:
+            raise web.HTTPBadRequest(text="Missing 'input'.")
+
+        events = await self.start_turn(session, user_input)
+        response = web.StreamResponse(headers={"Content-Type": "application/x-ndjson"})
+        await response.prepare(request)
+        while (event := await events.get()) is not None:
+            await response.write(json.dumps(event).encode('utf-8') + b"\n")
+        await response.write_eof()
+        return response
+
+    async def websocket(self, request):
+        session = self.get_session(request)
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+
+        async for msg in ws:
+            if msg.type != WSMsgType.TEXT or not msg.data.strip():
+                continue
+            try:
+                events = await self.start_turn(session, msg.data.strip())
+            except web.HTTPServiceUnavailable as e:
+                await ws.send_json({"type": "error", "error": e.text})
+                continue
+            while (event := await events.get()) is not None:
+                await ws.send_json(event)
+        return ws
+
+    async def transcribe(self, request):
+        audio = await request.read()
+        if not audio:
+            raise web.HTTPBadRequest(text="Expected WAV audio in the body.")
+        text = await asyncio.get_running_loop().run_in_executor(None, self.transcribe_wav, audio)
+        return web.json_response({"text": text})
+
+    async def warm_up(self, request):
+        asyncio.get_running_loop().run_in_executor(None, self.agent.warm_up)
+        return web.Response(status=202)
@@ -0,0 +1,39 @@
+# src/transcriber.py
+import threading
+
+class WhisperTranscriber:
+    """Speech-to-text with Whisper.
+
+    The model is loaded on the first transcription, so text-mode users and
+    thin clients never pay for Whisper and torch.
+    """
+
+    def __init__(self, model_size="base"):
+        self.model_size = model_size
+        self.model = None
+        self.load_error = None
+        # Whisper models are not safe to share between threads
+        self.lock = threading.Lock()
+
+    def load_model(self):
+        if self.model is None and self.load_error is None:
+            print("🎙️ Loading speech-to-text model...")
+            try:
+                import whisper
+                self.model = whisper.load_model(self.model_size)
+                print("✅ Speech-to-text model loaded.")
+            except Exception as e:
+                print(f"❌ Error loading whisper model: {e}")
+                print("   Please make sure you have ffmpeg installed (`sudo apt-get install ffmpeg`).")
+                self.load_error = e
+        return self.model
+
+    def transcribe(self, filename):
+        with self.lock:
+            if not self.load_model():
+                return "Error: Whisper model not loaded."
+            try:
+                result = self.model.transcribe(filename, fp16=False)
+                return result['text']
+            except Exception as e:
+                return f"Error during transcription: {str(e)}"
@@ -2,23 +2,26 @@
 import sounddevice as sd
 import numpy as np
 import scipy.io.wavfile as wav
-import whisper
 import os
 import tempfile
 import queue
 import threading
+import time
 import sys
+from .transcriber import WhisperTranscriber
 
 class VoiceInput:
-    def __init__(self, model_size="base"):
-        print("🎙️ Loading speech-to-text model...")
-        try:
-            self.model = whisper.load_model(model_size)
-            print("✅ Speech-to-text model loaded.")
-        except Exception as e:
-            print(f"❌ Error loading whisper model: {e}")
-            print("   Please make sure you have ffmpeg installed (`sudo apt-get install ffmpeg`).")
-            self.model = None
+    # Barge-in detection works on 100 ms blocks at 16 kHz
+    BLOCK_SIZE = 1600
+    CALIBRATION_BLOCKS = 3 # Blocks used to measure how loud Sakura's own voice is
+    BARGE_IN_BLOCKS = 2 # Consecutive loud blocks needed to count as Master speaking
+
+    def __init__(self, model_size="base", speech_threshold=500, echo_ratio=3.0, transcriber=None):
+        # Barge-in needs sound louder than speech_threshold and echo_ratio times Sakura's own echo
+        self.speech_threshold = speech_threshold
+        self.echo_ratio = echo_ratio
+        # Anything with transcribe(filename) -> text; Whisper is loaded on first use
+        self.transcriber = transcriber or WhisperTranscriber(model_size)
 
     def record_audio_continuous(self, sample_rate=16000):
         q = queue.Queue()
@@ -46,6 +49,44 @@ class VoiceInput:
         audio_data = np.concatenate(recorded_frames, axis=0)
         return audio_data, sample_rate
 
+    def monitor_barge_in(self, is_playing, on_speech, sample_rate=16000):
+        """Watch the microphone on a background thread while `is_playing()` is true.
+
+        The speakers also reach the microphone, so the first blocks measure how
+        loud Sakura's own voice is there and only sound well above that counts
+        as Master speaking. `on_speech` is then called once, from the audio thread.
+        """
+        def monitor():
+            echo_levels = []
+            loud_blocks = 0
+            heard_speech = threading.Event()
+
+            def callback(indata, frames, time_info, status):
+                nonlocal loud_blocks
+                if heard_speech.is_set():
+                    return
+                rms = float(np.sqrt(np.mean(indata.astype(np.float32) ** 2)))
+                if len(echo_levels) < self.CALIBRATION_BLOCKS:
+                    echo_levels.append(rms)
+                    return
+                threshold = max(self.speech_threshold, self.echo_ratio * max(echo_levels))
+                loud_blocks = loud_blocks + 1 if rms > threshold else 0
+                if loud_blocks >= self.BARGE_IN_BLOCKS:
+                    heard_speech.set()
+                    on_speech()
+
+            try:
+                with sd.InputStream(samplerate=sample_rate, channels=1, callback=callback,
+                                    dtype='int16', blocksize=self.BLOCK_SIZE):
+                    while is_playing() and not heard_speech.is_set():
+                        time.sleep(0.05)
+            except Exception as e:
+                print(f"Barge-in monitor error: {e}", file=sys.stderr)
+
+        thread = threading.Thread(target=monitor, daemon=True)
+        thread.start()
+        return thread
+
     def save_wav(self, audio_data, sample_rate):
         temp_dir = tempfile.gettempdir()
         temp_filename = os.path.join(temp_dir, "maid_san_input.wav")
@@ -53,15 +94,10 @@ class VoiceInput:
         return temp_filename
 
     def transcribe_audio(self, filename):
-        if not self.model:
-            return "Error: Whisper model not loaded."
         print("🧠 Transcribing audio...")
-        try:
-            result = self.model.transcribe(filename, fp16=False)
-            print("✅ Transcription finished.")
-            return result['text']
-        except Exception as e:
-            return f"Error during transcription: {str(e)}"
+        text = self.transcriber.transcribe(filename)
+        print("✅ Transcription finished.")
+        return text
 
     def listen(self):
         audio_data, sample_rate = self.record_audio_continuous()
@@ -0,0 +1,285 @@
+# src/voice_output.py
+import numpy as np
+import scipy.io.wavfile as wav
+import os
+import re
+import tempfile
+import queue
+import threading
+import time
+
+# A sentence can end at terminal punctuation followed by whitespace, or at a line break
+SENTENCE_END = re.compile(r'(?<=[.!?。！？])\s+|\n+')
+
+# Words ending in a period that do not end a sentence
+ABBREVIATIONS = {"etc.", "vs.", "mr.", "mrs.", "ms.", "dr.", "st.", "no.", "approx."}
+# Dotted abbreviations and initials, e.g. "e.g.", "i.e.", "U.S.", "J."
+DOTTED_ABBREVIATION = re.compile(r'(\w\.)+')
+
+class SentenceBuffer:
+    """Collects streamed text and hands it out one complete sentence at a time"""
+
+    def __init__(self):
+        self.buffer = ""
+
+    def feed(self, chunk):
+        """Add a chunk of text and return the sentences it completed."""
+        self.buffer += chunk
+        sentences = []
+        start = 0
+        for match in SENTENCE_END.finditer(self.buffer):
+            sentence = self.buffer[start:match.start()]
+            if "\n" not in match.group() and self.ends_with_abbreviation(sentence):
+                continue
+            if sentence.strip():
+                sentences.append(sentence.strip())
+            start = match.end()
+        self.buffer = self.buffer[start:]
+        return sentences
+
+    def flush(self):
+        """Return whatever is left as a final sentence."""
+        rest = self.buffer.strip()
+        self.buffer = ""
+        return [rest] if rest else []
+
+    @staticmethod
+    def ends_with_abbreviation(text):
+        words = text.split()
+        if not words:
+            return False
+        last = words[-1].lower()
+        return last in ABBREVIATIONS or DOTTED_ABBREVIATION.fullmatch(last) is not None
+
+# -------------------------------
+# TTS engines
+# -------------------------------
+class TTSEngine:
+    """Turns a sentence into audio. Subclasses implement `synthesize`."""
+
+    def synthesize(self, text):
+        """Return (audio_data, sample_rate) for the given text."""
+        raise NotImplementedError
+
+class StubTTSEngine(TTSEngine):
+    """Produces silence instead of speech, for tests and machines without TTS"""
+
+    def __init__(self, sample_rate=16000, seconds_per_word=0.05):
+        self.sample_rate = sample_rate
+        self.seconds_per_word = seconds_per_word
+        self.spoken = []
+
+    def synthesize(self, text):
+        self.spoken.append(text)
+        samples = int(len(text.split()) * self.seconds_per_word * self.sample_rate)
+        return np.zeros(max(samples, 1), dtype='int16'), self.sample_rate
+
+class Pyttsx3Engine(TTSEngine):
+    """Offline speech through pyttsx3 (espeak, SAPI5 or NSSpeechSynthesizer)"""
+
+    def __init__(self, rate=None):
+        self.rate = rate
+        self.engine = None
+
+    def synthesize(self, text):
+        # pyttsx3 is created lazily so it lives on the synthesis thread
+        if self.engine is None:
+            import pyttsx3
+            self.engine = pyttsx3.init()
+            if self.rate:
+                self.engine.setProperty('rate', self.rate)
+
+        fd, filename = tempfile.mkstemp(prefix="maid_san_output_", suffix=".wav")
+        os.close(fd)
+        try:
+            self.engine.save_to_file(text, filename)
+            self.engine.runAndWait()
+            sample_rate, audio_data = wav.read(filename)
+            return audio_data, sample_rate
+        finally:
+            try:
+                os.remove(filename)
+            except OSError:
+                pass
+
+TTS_ENGINES = {
+    'pyttsx3': Pyttsx3Engine,
+    'stub': StubTTSEngine,
+}
+
+# -------------------------------
+# Audio players
+# -------------------------------
+class SoundDevicePlayer:
+    """Plays audio on the default output device through sounddevice"""
+
+    def __init__(self):
+        # Imported here so the stub pipeline works without PortAudio
+        import sounddevice as sd
+        self.sd = sd
+
+    def play(self, audio_data, sample_rate):
+        self.sd.play(audio_data, sample_rate)
+
+    def is_active(self):
+        return self.sd.get_stream().active
+
+    def stop(self):
+        self.sd.stop()
+
+# -------------------------------
+# Voice output pipeline
+# -------------------------------
+class VoiceOutput:
+    """Speaks a streamed answer sentence by sentence.
+
+    Synthesis and playback each run on their own background thread, so the
+    first sentence is already playing while later ones are being synthesized
+    and the answer is still streaming in.
+    """
+
+    def __init__(self, engine="pyttsx3", enabled=True, player=None):
+        self.enabled = enabled
+        if isinstance(engine, TTSEngine):
+            self.engine = engine
+        else:
+            try:
+                self.engine = TTS_ENGINES[engine]()
+            except KeyError:
+                print(f"❌ Unknown TTS engine '{engine}', voice output disabled.")
+                self.enabled = False
+                self.engine = None
+        self.player = player
+
+        self.sentences = SentenceBuffer()
+        self.text_queue = queue.Queue()
+        self.audio_queue = queue.Queue()
+        self.interrupted = threading.Event()
+        self.generation = 0 # Bumped on every stop() so stale audio is dropped
+        self.lock = threading.Lock()
+        self.pending = 0 # Sentences queued but not yet played or dropped
+        self.idle = threading.Event()
+        self.idle.set()
+
+        self.utterance_start = None
+        self.time_to_first_audio = None
+        self.first_audio = threading.Event()
+        # Called on the playback thread once a reply's first sentence is playing
+        self.on_first_audio = None
+
+        if self.enabled:
+            if self.player is None:
+                self.player = SoundDevicePlayer()
+            threading.Thread(target=self._synthesis_loop, daemon=True).start()
+            threading.Thread(target=self._playback_loop, daemon=True).start()
+
+    def begin(self, start_time=None):
+        """Start a new reply. Time-to-first-audio is measured from `start_time`."""
+        self.discard()
+        self.utterance_start = start_time if start_time is not None else time.perf_counter()
+        self.time_to_first_audio = None
+        self.first_audio.clear()
+
+    def discard(self):
+        """Drop what was said of the current reply so far, keeping its time-to-first-audio clock."""
+        self.stop()
+        self.interrupted.clear()
+        if self.time_to_first_audio is None:
+            self.first_audio.clear()
+
+    def feed(self, chunk):
+        """Queue every sentence completed by a chunk of the streamed answer."""
+        if not self.enabled:
+            return
+        for sentence in self.sentences.feed(chunk):
+            self._queue(sentence)
+
+    def flush(self):
+        """Queue the last, unterminated sentence of the answer."""
+        if not self.enabled:
+            return
+        for sentence in self.sentences.flush():
+            self._queue(sentence)
+
+    def stop(self):
+        """Barge-in: drop everything queued and cut off the current sentence.
+
+        Only flags are touched here, so it is safe to call from an audio callback.
+        """
+        with self.lock:
+            self.generation += 1
+        self.sentences.buffer = ""
+        self.interrupted.set()
+        # Nobody should wait for audio that will not play any more
+        self.first_audio.set()
+
+    def is_speaking(self):
+        """Whether any sentence of the current reply is still queued or playing."""
+        return not self.idle.is_set()
+
+    def wait_until_done(self, timeout=None):
+        """Block until everything queued has been played or dropped."""
+        return self.idle.wait(timeout)
+
+    def wait_for_first_audio(self, timeout=None):
+        """Block until the reply's first audio starts, returning time-to-first-audio.
+
+        Returns None if nothing was spoken (voice output disabled, empty reply,
+        every sentence failed to synthesize, or the reply was stopped before it
+        played).
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self.enabled and not self.first_audio.is_set() and self.is_speaking():
+            if deadline is not None and time.monotonic() >= deadline:
+                break
+            self.first_audio.wait(0.05)
+        return self.time_to_first_audio
+
+    def _queue(self, sentence):
+        with self.lock:
+            self.pending += 1
+            self.idle.clear()
+        self.text_queue.put((self.generation, sentence))
+
+    def _done(self):
+        with self.lock:
+            self.pending -= 1
+            if self.pending == 0:
+                self.idle.set()
+
+    def _synthesis_loop(self):
+        while True:
+            generation, sentence = self.text_queue.get()
+            if generation != self.generation:
+                self._done()
+                continue
+            try:
+                audio_data, sample_rate = self.engine.synthesize(sentence)
+            except Exception as e:
+                print(f"❌ Error during speech synthesis: {e}")
+                self._done()
+                continue
+            self.audio_queue.put((generation, audio_data, sample_rate))
+
+    def _playback_loop(self):
+        while True:
+            generation, audio_data, sample_rate = self.audio_queue.get()
+            try:
+                if generation != self.generation:
+                    continue
+                first = self.time_to_first_audio is None and self.utterance_start is not None
+                if first:
+                    self.time_to_first_audio = time.perf_counter() - self.utterance_start
+                    self.first_audio.set()
+                self.player.play(audio_data, sample_rate)
+                if first and self.on_first_audio:
+                    self.on_first_audio()
+                # Poll instead of blocking so a barge-in can cut playback short
+                while self.player.is_active():
+                    if self.interrupted.wait(0.02) or generation != self.generation:
+                        self.player.stop()
+                        break
+            except Exception as e:
+                print(f"❌ Error during audio playback: {e}")
+            finally:
+                self._done()
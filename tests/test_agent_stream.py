@@ -0,0 +1,87 @@
+import queue
+
+import pytest
+
+from src.agent import AnimeMaidAgent, AnswerStreamHandler
+
+
+def drain(events):
+    items = []
+    while not events.empty():
+        items.append(events.get())
+    return items
+
+
+def test_react_handler_streams_only_the_final_answer():
+    events = queue.Queue()
+    handler = AnswerStreamHandler(events, react=True)
+    handler.on_llm_start({}, [])
+    for token in ["Thought: no tool needed\nFinal", " Answer:", " Hii", " Master!"]:
+        handler.on_llm_new_token(token)
+    assert drain(events) == [{"type": "chunk", "text": "Hii"}, {"type": "chunk", "text": " Master!"}]
+
+
+def test_handler_resets_when_a_new_llm_call_starts():
+    events = queue.Queue()
+    handler = AnswerStreamHandler(events, react=False)
+    handler.on_llm_start({}, [])
+    handler.on_llm_new_token("Let me check.")
+    handler.on_llm_start({}, [])
+    handler.on_llm_new_token("Done, Master!")
+    assert drain(events) == [
+        {"type": "chunk", "text": "Let me check."},
+        {"type": "reset"},
+        {"type": "chunk", "text": "Done, Master!"},
+    ]
+
+
+def test_handler_does_not_reset_after_silent_llm_call():
+    events = queue.Queue()
+    handler = AnswerStreamHandler(events, react=True)
+    handler.on_llm_start({}, [])
+    handler.on_llm_new_token("Thought: use a tool\nAction: get_system_info")
+    handler.on_llm_start({}, [])
+    assert drain(events) == []
+
+
+@pytest.fixture
+def agent(monkeypatch):
+    # No Ollama or prompt hub needed, process_with_agent is faked per test
+    monkeypatch.setattr(AnimeMaidAgent, "setup_agent", lambda self: None)
+    agent = AnimeMaidAgent(config_path="missing.json")
+    agent.agent_mode = 'tool_calling'
+    return agent
+
+
+def test_stream_with_agent_ends_with_authoritative_output(agent):
+    def process_with_agent(user_input, callbacks=None, chat_history=None):
+        handler = callbacks[0]
+        handler.on_llm_start({}, [])
+        handler.on_llm_new_token("Let me look that up.")
+        handler.on_llm_start({}, [])
+        handler.on_llm_new_token("Here you go, Master!")
+        return "Here you go, Master!"
+
+    agent.process_with_agent = process_with_agent
+    assert list(agent.stream_with_agent("hi")) == [
+        {"type": "chunk", "text": "Let me look that up."},
+        {"type": "reset"},
+        {"type": "chunk", "text": "Here you go, Master!"},
+        {"type": "done", "output": "Here you go, Master!"},
+    ]
+
+
+def test_stream_with_agent_replaces_partial_answer_with_error(agent):
+    def process_with_agent(user_input, callbacks=None, chat_history=None):
+        handler = callbacks[0]
+        handler.on_llm_start({}, [])
+        handler.on_llm_new_token("Here you")
+        return "An internal error occurred: boom"
+
+    agent.process_with_agent = process_with_agent
+    assert list(agent.stream_with_agent("hi")) == [
+        {"type": "chunk", "text": "Here you"},
+        {"type": "reset"},
+        {"type": "chunk", "text": "An internal error occurred: boom"},
+        {"type": "done", "output": "An internal error occurred: boom"},
+    ]
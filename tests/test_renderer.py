@@ -0,0 +1,49 @@
+import io
+
+from src.renderer import TerminalRenderer
+
+
+def test_clear_keeps_scrollback():
+    assert "\033[3J" not in TerminalRenderer.CLEAR
+
+
+def test_fast_mode_keeps_response_on_screen():
+    stream = io.StringIO()
+    renderer = TerminalRenderer(fast=True, stream=stream)
+    stream.write("Sakura: Hii Master!\n")
+    renderer.prompt_continue()
+    renderer.clear()
+    stream.write("awake screen\n")
+    assert renderer.CLEAR not in stream.getvalue()
+
+    # Only the screen right after a response is kept
+    renderer.clear()
+    assert stream.getvalue().endswith(renderer.CLEAR)
+
+
+def test_fast_mode_animation_draws_last_frame_only():
+    stream = io.StringIO()
+    renderer = TerminalRenderer(fast=True, stream=stream)
+    renderer.animate(["one", "two", "three"], interval=10)
+    renderer.wait()
+    assert stream.getvalue() == renderer.CLEAR + "three\n"
+
+
+def test_draw_waits_for_running_animation():
+    stream = io.StringIO()
+    renderer = TerminalRenderer(stream=stream)
+    renderer.animate(["one", "two"], interval=0.05)
+    renderer.draw("next")
+    assert stream.getvalue().split(renderer.CLEAR)[1:] == ["one\n", "two\n", "next\n"]
+
+
+def test_falls_back_to_cls_without_ansi_support(monkeypatch):
+    commands = []
+    monkeypatch.setattr(TerminalRenderer, "enable_ansi", lambda self: False)
+    monkeypatch.setattr("src.renderer.os.system", commands.append)
+    stream = io.StringIO()
+    renderer = TerminalRenderer(stream=stream)
+    renderer.clear()
+    renderer.draw("awake screen")
+    assert commands == ["cls", "cls"]
+    assert stream.getvalue() == "awake screen\n"
@@ -0,0 +1,178 @@
+import asyncio
+import json
+import threading
+
+from aiohttp.test_utils import TestClient, TestServer
+
+from src.auth import create_token_file
+from src.client import RemoteMaidAgent
+from src.server import AgentServer
+
+
+class FakeAgent:
+    """Streams a canned answer, optionally holding it until `release` is set"""
+
+    name = 'Sakura'
+    ollama_model = 'fake'
+
+    def __init__(self, hold=False):
+        self.release = threading.Event()
+        if not hold:
+            self.release.set()
+        self.finished = threading.Event()
+
+    def is_ready(self):
+        return True
+
+    def warm_up(self):
+        pass
+
+    def get_history(self, chat_history):
+        return [{"role": role, "content": content} for role, content in chat_history]
+
+    def stream_with_agent(self, user_input, chat_history=None):
+        chat_history.append(("human", user_input))
+        yield {"type": "chunk", "text": "Hii Master!"}
+        self.release.wait(5)
+        chat_history.append(("ai", "Hii Master!"))
+        self.finished.set()
+        yield {"type": "done", "output": "Hii Master!"}
+
+
+class FakeTranscriber:
+    def transcribe(self, filename):
+        with open(filename, 'rb') as f:
+            return f"heard {len(f.read())} bytes"
+
+
+TOKEN = 'test-token'
+
+
+def run(test, server, headers=None):
+    if headers is None:
+        headers = {"Authorization": f"Bearer {server.token}"}
+
+    async def main():
+        async with TestClient(TestServer(server.create_app()), headers=headers) as client:
+            await test(client)
+    asyncio.run(main())
+
+
+async def create_session(client):
+    response = await client.post('/sessions')
+    return (await response.json())['session_id']
+
+
+async def chat(client, session_id, text):
+    response = await client.post(f'/sessions/{session_id}/chat', json={"input": text})
+    return [json.loads(line) for line in (await response.text()).splitlines()]
+
+
+def test_sessions_have_isolated_history():
+    server = AgentServer(FakeAgent(), transcriber=FakeTranscriber(), token=TOKEN)
+
+    async def test(client):
+        first, second = await create_session(client), await create_session(client)
+        events = await chat(client, first, "hello")
+        assert events[-1] == {"type": "done", "output": "Hii Master!"}
+
+        history = await (await client.get(f'/sessions/{first}/history')).json()
+        assert [m["content"] for m in history] == ["hello", "Hii Master!"]
+        assert await (await client.get(f'/sessions/{second}/history')).json() == []
+
+        response = await client.post('/sessions/unknown/chat', json={"input": "hi"})
+        assert response.status == 404
+
+    run(test, server)
+
+
+def test_disconnected_client_keeps_slot_until_agent_finishes():
+    agent = FakeAgent(hold=True)
+    server = AgentServer(agent, max_concurrency=1, transcriber=FakeTranscriber())
+
+    async def test(client):
+        session_id = await create_session(client)
+        response = await client.post(f'/sessions/{session_id}/chat', json={"input": "hello"})
+        await response.content.readline()
+        response.close() # Client goes away halfway through the answer
+        await asyncio.sleep(0.1)
+        assert server.queue.active == 1
+
+        agent.release.set()
+        await asyncio.get_running_loop().run_in_executor(None, agent.finished.wait, 5)
+        for _ in range(50):
+            if server.queue.active == 0:
+                break
+            await asyncio.sleep(0.02)
+        assert server.queue.active == 0
+        assert len(server.sessions[session_id].chat_history) == 2
+
+    run(test, server)
+
+
+def test_rejects_turns_when_queue_is_full():
+    agent = FakeAgent(hold=True)
+    server = AgentServer(agent, max_concurrency=1, max_waiting=0, transcriber=FakeTranscriber())
+
+    async def test(client):
+        first, second = await create_session(client), await create_session(client)
+        busy = await client.post(f'/sessions/{first}/chat', json={"input": "hello"})
+        assert busy.status == 200 # A free slot is taken even when nothing may wait
+        assert json.loads(await busy.content.readline())["type"] == "chunk"
+        response = await client.post(f'/sessions/{second}/chat', json={"input": "hello"})
+        assert response.status == 503
+        agent.release.set()
+        await busy.read()
+
+    run(test, server)
+
+
+def test_transcribes_uploaded_audio():
+    server = AgentServer(FakeAgent(), transcriber=FakeTranscriber())
+
+    async def test(client):
+        response = await client.post('/transcribe', data=b"RIFF1234")
+        assert await response.json() == {"text": "heard 8 bytes"}
+
+    run(test, server)
+
+
+def test_rejects_requests_without_token_or_from_web_pages():
+    server = AgentServer(FakeAgent(), transcriber=FakeTranscriber(), token=TOKEN)
+
+    async def test(client):
+        response = await client.post('/sessions')
+        assert response.status == 401
+        response = await client.post('/sessions', headers={"Authorization": "Bearer wrong"})
+        assert response.status == 401
+
+        authorized = {"Authorization": f"Bearer {TOKEN}"}
+        # A page on a rebound domain, or any page in a local browser
+        response = await client.post('/sessions', headers={**authorized, "Host": "evil.example:8765"})
+        assert response.status == 403
+        response = await client.post('/sessions', headers={**authorized, "Origin": "http://evil.example"})
+        assert response.status == 403
+        assert server.sessions == {}
+
+    run(test, server, headers={})
+
+
+def test_remote_agent_recreates_lost_session_and_closes_it(tmp_path):
+    token_file = str(tmp_path / 'server_token')
+    server = AgentServer(FakeAgent(), transcriber=FakeTranscriber(), token=create_token_file(token_file))
+
+    async def test(client):
+        loop = asyncio.get_running_loop()
+        url = str(client.make_url('')).rstrip('/')
+        agent = await loop.run_in_executor(None, RemoteMaidAgent, url, 'missing.json', token_file)
+        assert agent.is_ready()
+
+        server.sessions.clear() # As if the server had restarted
+        output = await loop.run_in_executor(None, agent.process_with_agent, "hello")
+        assert output == "Hii Master!"
+        assert list(server.sessions) == [agent.session_id]
+
+        await loop.run_in_executor(None, agent.close)
+        assert server.sessions == {}
+
+    run(test, server)
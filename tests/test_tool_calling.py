@@ -0,0 +1,68 @@
+from langchain.agents import AgentExecutor
+from langchain.tools import StructuredTool
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+from langchain_ollama.chat_models import ChatOllama
+
+from src.agent import AnimeMaidAgent, tool_calling_parsing_error
+
+
+class ScriptedOllama(ChatOllama):
+    """ChatOllama whose Ollama server replies with canned /api/chat responses.
+
+    Everything after the HTTP call (tool call parsing, message building) is
+    the real ChatOllama code, so the agent sees what it would see in use.
+    """
+
+    def _create_chat_stream(self, messages, stop=None, **kwargs):
+        self.metadata["requests"].append(messages)
+        yield {"message": self.metadata["responses"].pop(0), "done": True, "done_reason": "stop"}
+
+
+def tool_call(name, arguments):
+    return {"role": "assistant", "content": "", "tool_calls": [{"function": {"name": name, "arguments": arguments}}]}
+
+
+def run_turn(monkeypatch, responses):
+    monkeypatch.setattr(AnimeMaidAgent, "setup_agent", lambda self: None)
+    maid = AnimeMaidAgent(config_path="missing.json")
+    llm = ScriptedOllama(model="fake", metadata={"responses": responses, "requests": []})
+    tools = [StructuredTool.from_function(lambda city: f"Sunny in {city}", name="get_weather",
+                                          description="Get the weather for a city.")]
+    executor = AgentExecutor(agent=maid.build_tool_calling_agent(llm, tools), tools=tools,
+                             handle_parsing_errors=tool_calling_parsing_error, max_iterations=4)
+    output = executor.invoke({"input": "Weather in Tokyo?", "chat_history": []})["output"]
+    return output, llm.metadata["requests"]
+
+
+def test_tool_results_go_back_as_tool_messages(monkeypatch):
+    output, requests = run_turn(monkeypatch, [
+        tool_call("get_weather", {"city": "Tokyo"}),
+        {"role": "assistant", "content": "It's sunny, Master!"},
+    ])
+    assert output == "It's sunny, Master!"
+    assert isinstance(requests[1][-1], ToolMessage)
+    assert requests[1][-1].content == "Sunny in Tokyo"
+
+
+def test_malformed_arguments_are_fed_back_as_human_message(monkeypatch):
+    output, requests = run_turn(monkeypatch, [
+        tool_call("get_weather", "{city: Tokyo"),
+        tool_call("get_weather", {"city": "Tokyo"}),
+        {"role": "assistant", "content": "It's sunny, Master!"},
+    ])
+    assert output == "It's sunny, Master!"
+    feedback = requests[1][-1]
+    assert isinstance(feedback, HumanMessage)
+    assert "could not be used" in feedback.content
+    assert "{city: Tokyo" in feedback.content
+    assert not any(isinstance(m, AIMessage) for m in requests[1])
+
+
+def test_empty_response_is_fed_back_as_human_message(monkeypatch):
+    output, requests = run_turn(monkeypatch, [
+        {"role": "assistant", "content": ""},
+        {"role": "assistant", "content": "Hii Master!"},
+    ])
+    assert output == "Hii Master!"
+    assert isinstance(requests[1][-1], HumanMessage)
+    assert "Empty response" in requests[1][-1].content
@@ -0,0 +1,163 @@
+import threading
+import time
+
+from src.voice_output import SentenceBuffer, StubTTSEngine, VoiceOutput
+
+
+class FakePlayer:
+    """Records playback instead of using an audio device"""
+
+    def __init__(self, seconds=0.0):
+        self.seconds = seconds
+        self.played = []
+        self.stops = 0
+        self.until = 0
+
+    def play(self, audio_data, sample_rate):
+        self.played.append(len(audio_data))
+        self.until = time.perf_counter() + self.seconds
+
+    def is_active(self):
+        return time.perf_counter() < self.until
+
+    def stop(self):
+        self.stops += 1
+        self.until = 0
+
+
+class GatedStubEngine(StubTTSEngine):
+    """Stub engine that holds every synthesis until the gate opens"""
+
+    def __init__(self):
+        super().__init__()
+        self.started = threading.Event()
+        self.gate = threading.Event()
+
+    def synthesize(self, text):
+        self.started.set()
+        self.gate.wait(2)
+        return super().synthesize(text)
+
+
+def feed_all(buffer, chunks):
+    sentences = []
+    for chunk in chunks:
+        sentences += buffer.feed(chunk)
+    return sentences
+
+
+def test_sentence_buffer_splits_streamed_text():
+    buffer = SentenceBuffer()
+    sentences = feed_all(buffer, ["Hii Mas", "ter! How can ", "I help? The", " answer is 3.5 today.\nNext"])
+    assert sentences == ["Hii Master!", "How can I help?", "The answer is 3.5 today."]
+    assert buffer.flush() == ["Next"]
+    assert buffer.flush() == []
+
+
+def test_sentence_buffer_keeps_abbreviations_in_sentence():
+    buffer = SentenceBuffer()
+    sentences = feed_all(buffer, ["Try fruit, e.g. apples, i.e. red ones. ", "Mr. Tanaka ", "agrees! Done"])
+    assert sentences == ["Try fruit, e.g. apples, i.e. red ones.", "Mr. Tanaka agrees!"]
+    assert buffer.flush() == ["Done"]
+
+
+def test_sentence_buffer_line_break_always_ends_sentence():
+    buffer = SentenceBuffer()
+    assert buffer.feed("Fruit, etc.\nNext line") == ["Fruit, etc."]
+
+
+def test_voice_output_speaks_sentences_in_order():
+    engine, player = StubTTSEngine(), FakePlayer()
+    voice_output = VoiceOutput(engine=engine, player=player)
+    voice_output.begin()
+    voice_output.feed("Hello Master. How are")
+    voice_output.feed(" you?")
+    voice_output.flush()
+    assert voice_output.wait_until_done(2)
+    assert engine.spoken == ["Hello Master.", "How are you?"]
+    assert len(player.played) == 2
+
+
+def test_stop_drops_stale_generation():
+    engine, player = GatedStubEngine(), FakePlayer()
+    voice_output = VoiceOutput(engine=engine, player=player)
+    voice_output.begin()
+    voice_output.feed("One. Two. Three.")
+    voice_output.flush()
+    assert engine.started.wait(2)
+
+    voice_output.stop()
+    engine.gate.set()
+    assert voice_output.wait_until_done(2)
+    # Only the sentence already being synthesized got that far, and it was never played
+    assert engine.spoken == ["One."]
+    assert player.played == []
+
+    voice_output.begin()
+    voice_output.feed("Again!")
+    voice_output.flush()
+    assert voice_output.wait_until_done(2)
+    assert engine.spoken == ["One.", "Again!"]
+    assert len(player.played) == 1
+
+
+def test_stop_cuts_off_current_sentence():
+    player = FakePlayer(seconds=5)
+    voice_output = VoiceOutput(engine=StubTTSEngine(), player=player)
+    voice_output.begin()
+    voice_output.feed("A long sentence.")
+    voice_output.flush()
+    assert voice_output.wait_for_first_audio(2) is not None
+
+    voice_output.stop()
+    assert voice_output.wait_until_done(1)
+    assert player.stops == 1
+
+
+def test_time_to_first_audio_is_ready_for_short_reply():
+    voice_output = VoiceOutput(engine=StubTTSEngine(), player=FakePlayer())
+    start = time.perf_counter()
+    voice_output.begin(start)
+    voice_output.feed("Hii Master!")
+    voice_output.flush()
+    time_to_first_audio = voice_output.wait_for_first_audio(2)
+    assert time_to_first_audio is not None
+    assert 0 <= time_to_first_audio <= time.perf_counter() - start
+
+
+def test_time_to_first_audio_is_none_without_speech():
+    voice_output = VoiceOutput(engine=StubTTSEngine(), player=FakePlayer())
+    voice_output.begin()
+    voice_output.flush()
+    assert voice_output.wait_for_first_audio(0.1) is None
+
+    disabled = VoiceOutput(engine=StubTTSEngine(), enabled=False)
+    disabled.begin()
+    disabled.feed("Hii Master!")
+    disabled.flush()
+    assert disabled.wait_for_first_audio(0.1) is None
+
+
+def test_first_audio_hook_fires_while_answer_still_streams():
+    voice_output = VoiceOutput(engine=StubTTSEngine(), player=FakePlayer(seconds=0.5))
+    started = threading.Event()
+    voice_output.on_first_audio = started.set
+    voice_output.begin()
+    voice_output.feed("Hii Master! Still thinking about the rest")
+    assert started.wait(2) # Before flush(), i.e. mid-stream
+    assert voice_output.is_speaking()
+    voice_output.stop()
+
+
+class FailingEngine(StubTTSEngine):
+    def synthesize(self, text):
+        raise RuntimeError("no voice")
+
+
+def test_time_to_first_audio_does_not_hang_when_synthesis_fails():
+    voice_output = VoiceOutput(engine=FailingEngine(), player=FakePlayer())
+    voice_output.begin()
+    voice_output.feed("Hii Master!")
+    start = time.perf_counter()
+    assert voice_output.wait_for_first_audio() is None
+    assert time.perf_counter() - start < 1